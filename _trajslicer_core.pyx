@@ -0,0 +1,141 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled per-atom loop for the LAMMPS to XYZ conversion in trajslicer_src.py
+
+Build it in place next to trajslicer_src.py with:
+    pip install cython
+    cythonize -i _trajslicer_core.pyx
+
+trajslicer_src.py picks the compiled module up automatically when it is importable.
+"""
+from cpython.object cimport PyObject
+from libc.stdlib cimport strtoll
+
+cdef extern from "Python.h":
+    double PyOS_string_to_double(const char *s, char **endptr, PyObject *overflow_exception) except? -1.0
+
+
+cdef inline bint _is_space(char c) nogil:
+    # Same set of separators as bytes.split()
+    return c == b' ' or c == b'\t' or c == b'\n' or c == b'\r' or c == b'\x0b' or c == b'\x0c'
+
+
+cdef inline bint _parse_int(const char *token, Py_ssize_t length, long long *value):
+    cdef char *end
+    if length <= 0:  # Missing column
+        return False
+    value[0] = strtoll(token, &end, 10)
+    return end == token + length
+
+
+cdef inline bint _parse_float(const char *token, Py_ssize_t length, double *value):
+    cdef char *end
+    if length <= 0:  # Missing column
+        return False
+    try:
+        # Same parser as float(), so the coordinates round identically (overflow gives +-inf)
+        value[0] = PyOS_string_to_double(token, &end, NULL)
+    except ValueError:
+        return False
+    return end == token + length
+
+
+def convert_atom_lines(list atom_lines, col_layout, list label_of, filter_type=None, dict index_assignments=None):
+    """
+    Compiled drop-in for the per-atom loops in trajslicer_src.convert_frame_to_xyz
+
+    Args:
+        atom_lines (list): Atom lines (bytes) of a single LAMMPS frame
+        col_layout (ColumnLayout): Column layout from the ITEM: ATOMS header
+        label_of (list): Element label of each atom type, indexed by type
+        filter_type (list, optional): List of atom types to keep. If None, keep all atoms.
+        index_assignments (dict, optional): Mapping of atom indices to element labels.
+                                          Takes precedence over the type labels when specified.
+
+    Returns:
+        list: XYZ atom lines (element x y z atom_id)
+    """
+    cdef Py_ssize_t x_col = col_layout.x, y_col = col_layout.y, z_col = col_layout.z
+    cdef Py_ssize_t type_col = col_layout.type
+    cdef Py_ssize_t id_col = -1 if col_layout.id is None else col_layout.id
+    cdef Py_ssize_t n_labels = len(label_of)
+    cdef bint use_assignments = index_assignments is not None and id_col >= 0
+    cdef set keep_types = set(filter_type) if filter_type is not None else None
+
+    # Start offset and length of the tokens we need, in x, y, z, type, id order
+    cdef Py_ssize_t cols[5]
+    cdef Py_ssize_t starts[5]
+    cdef Py_ssize_t lengths[5]
+    cols[0] = x_col
+    cols[1] = y_col
+    cols[2] = z_col
+    cols[3] = type_col
+    cols[4] = id_col
+
+    cdef const char *buf
+    cdef Py_ssize_t n, pos, start, n_tokens, k
+    cdef long long atom_type, atom_id
+    cdef double x, y, z
+    cdef bytes line
+
+    xyz_atom_lines = []
+    for line in atom_lines:
+        if not line or line.startswith(b"ITEM:"):
+            continue  # Skip empty lines or new section headers
+
+        buf = line
+        n = len(line)
+        for k in range(5):
+            starts[k] = 0
+            lengths[k] = -1
+
+        # Tokenize the line, remembering only the columns we need
+        pos = 0
+        n_tokens = 0
+        while pos < n:
+            while pos < n and _is_space(buf[pos]):
+                pos += 1
+            if pos == n:
+                break
+            start = pos
+            while pos < n and not _is_space(buf[pos]):
+                pos += 1
+            for k in range(5):
+                if cols[k] == n_tokens:
+                    starts[k] = start
+                    lengths[k] = pos - start
+            n_tokens += 1
+
+        if n_tokens < 2:
+            continue
+
+        # Skip lines that cannot be parsed, as the Python loops do
+        if not _parse_int(buf + starts[3], lengths[3], &atom_type):
+            continue
+        if id_col >= 0:
+            if not _parse_int(buf + starts[4], lengths[4], &atom_id):
+                continue
+        else:
+            atom_id = atom_type  # Fallback to type if no ID
+
+        # Check if we should keep this atom type (for filtering)
+        if keep_types is not None and atom_type not in keep_types:
+            continue
+
+        if not (_parse_float(buf + starts[0], lengths[0], &x)
+                and _parse_float(buf + starts[1], lengths[1], &y)
+                and _parse_float(buf + starts[2], lengths[2], &z)):
+            continue
+
+        # Determine element label: index assignments take precedence over type labels
+        if use_assignments and atom_id in index_assignments:
+            element = index_assignments[atom_id]
+        elif 0 <= atom_type < n_labels:
+            element = label_of[atom_type]
+        else:
+            element = f"Type{atom_type}"
+
+        # XYZ format: element x y z atom_id
+        xyz_atom_lines.append(f"{element} {x} {y} {z} {atom_id}")
+
+    return xyz_atom_lines
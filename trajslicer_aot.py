@@ -0,0 +1,32 @@
+"""
+Ahead-of-time build of the Numba LAMMPS atom parser from trajslicer_src.py
+
+Running this script once compiles the atom parser into a _trajslicer_aot
+extension module next to trajslicer_src.py:
+    python trajslicer_aot.py
+
+trajslicer_src.py then imports the compiled kernel instead of JIT-compiling it
+on every run, and no longer needs Numba at runtime (NumPy is still required).
+"""
+import os
+
+from numba.pycc import CC
+
+from trajslicer_src import _build_jit_parser
+
+try:
+    _parse_lammps_atoms_jit = _build_jit_parser()
+except ImportError as error:
+    raise SystemExit(f"Error: {error}. Install it with: pip install numpy numba")
+
+cc = CC('_trajslicer_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+@cc.export('parse_lammps_atoms_into',
+           'int64(uint8[:], int64, int64, int64, int64, int64, int64[:], int64[:], float64[:, :])')
+def parse_lammps_atoms_into(buf, x_col, y_col, z_col, type_col, id_col, types, ids, xyz):
+    return _parse_lammps_atoms_jit(buf, x_col, y_col, z_col, type_col, id_col, types, ids, xyz)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Compiled parse_lammps_atoms_into into {cc.output_dir}")
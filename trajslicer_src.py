@@ -1,3 +1,61 @@
+import io
+from collections import namedtuple
+from dataclasses import dataclass
+
+np = None  # Imported by _import_numpy(), only when LAMMPS atoms are converted
+_numpy_loaded = False
+
+try:
+    import _trajslicer_core
+except ImportError:
+    # The compiled per-atom loop is optional, see _trajslicer_core.pyx
+    _trajslicer_core = None
+
+_READ_BLOCK_SIZE = 16 << 20  # 16 MiB per read() call
+_WRITE_BUFFER_SIZE = 1 << 22  # 4 MiB output buffer
+_SENDFILE_MIN_SIZE = 1 << 20  # Smaller copies are cheaper through the output buffer
+
+
+def _iter_lammps_frames(infile, block_size=_READ_BLOCK_SIZE):
+    """
+    Yield the frames of a binary LAMMPS dump, reading it in large blocks
+    
+    Blocks are appended to a single bytearray and a frame is cut off wherever an
+    "ITEM: TIMESTEP" line starts, so no per-line objects are created. Anything before
+    the first "ITEM: TIMESTEP" line is skipped.
+    
+    Args:
+        infile (file): Input file opened in binary mode
+        block_size (int, optional): Number of bytes requested per read() call
+        
+    Yields:
+        bytes: One frame at a time, from its ITEM: TIMESTEP line up to the next one
+    """
+    marker = b"\nITEM: TIMESTEP"
+    frame_buf = bytearray()
+    search_from = 0
+    while True:
+        buf = infile.read(block_size)
+        if not buf:
+            break
+        frame_buf += buf
+        while True:
+            boundary = frame_buf.find(marker, search_from)
+            if boundary == -1:
+                # The marker may straddle the end of the block
+                search_from = max(0, len(frame_buf) - len(marker) + 1)
+                break
+            if frame_buf.startswith(b"ITEM: TIMESTEP"):
+                # Views are released explicitly, the bytearray cannot be resized while exported
+                with memoryview(frame_buf) as view, view[:boundary + 1] as head:
+                    frame = bytes(head)
+                yield frame
+            # Dropping the head of a bytearray only moves its start offset
+            del frame_buf[:boundary + 1]
+            search_from = 0
+    if frame_buf.startswith(b"ITEM: TIMESTEP"):
+        yield bytes(frame_buf)
+
 def detect_file_type(input_file):
     """
     Detect if the input file is LAMMPS dump format or XYZ format
@@ -8,20 +66,21 @@ def detect_file_type(input_file):
     Returns:
         str: 'lammps' or 'xyz'
     """
-    with open(input_file, 'r') as f:
-        first_line = f.readline().strip()
-        
-        # LAMMPS dump files start with "ITEM: TIMESTEP"
-        if first_line.startswith("ITEM: TIMESTEP"):
-            return 'lammps'
-        
-        # XYZ files start with a number (atom count)
-        try:
-            int(first_line)
-            return 'xyz'
-        except ValueError:
-            # If neither, assume LAMMPS (default behavior)
-            return 'lammps'
+    # A short binary probe is enough to see the first line, no text decoding needed
+    with open(input_file, 'rb') as f:
+        head = f.read(64)
+    
+    # LAMMPS dump files start with "ITEM: TIMESTEP"
+    if head.startswith(b"ITEM: TIMESTEP"):
+        return 'lammps'
+    
+    # XYZ files start with a number (atom count)
+    try:
+        int(head.split(b"\n", 1)[0])
+        return 'xyz'
+    except ValueError:
+        # If neither, assume LAMMPS (default behavior)
+        return 'lammps'
 
 def convert_lammps_to_xyz(input_file, output_file, filter_type=None, sample_rate=1, 
                      atom_labels=None, index_assignments=None, start_frame=None, end_frame=None):
@@ -52,77 +111,58 @@ def convert_lammps_to_xyz(input_file, output_file, filter_type=None, sample_rate
     if atom_labels is None:
         atom_labels = {1: 'C', 2: 'Xe'}
     
-    # Count number of frames for progress bar
-    total_frames = 0
-    with open(input_file, 'r') as f:
-        for line in f:
-            if line.startswith("ITEM: TIMESTEP"):
-                total_frames += 1
-    
     # Set default values for start_frame and end_frame
-    if start_frame is None:
+    if start_frame is None or start_frame < 0:
         start_frame = 0
-    if end_frame is None:
-        end_frame = total_frames - 1
     
-    # Validate frame range
-    if start_frame < 0:
-        start_frame = 0
-    if end_frame >= total_frames:
-        end_frame = total_frames - 1
-    if start_frame > end_frame:
+    # The frame count is not known up front, so an open end_frame runs to the end of the file
+    stop_frame = float('inf') if end_frame is None else end_frame
+    if start_frame > stop_frame:
         print(f"Error: start_frame ({start_frame}) cannot be greater than end_frame ({end_frame})")
         return
     
-    frames_to_process = end_frame - start_frame + 1
-    
-    with open(input_file, 'r') as infile, open(output_file, 'w') as outfile:
-        frame_lines = []
-        current_section = None
+    with open(input_file, 'rb', buffering=0) as infile, \
+            open(output_file, 'w', buffering=_WRITE_BUFFER_SIZE) as outfile:
+        col_layout = None  # Atom column layout, carried over from frame to frame
+        atom_buffers = AtomBuffers()  # Parsing arrays, allocated once and reused by every frame
         current_frame = 0
         frames_written = 0
         
         # We'll collect complete frames and process them
         print(f"Converting LAMMPS dump file to XYZ format...")
-        print(f"Processing snapshots {start_frame} to {end_frame} (total: {frames_to_process} frames)")
-        pbar = tqdm(total=frames_to_process, unit="frames")
+        if end_frame is None:
+            print(f"Processing snapshots {start_frame} to end of file")
+        else:
+            print(f"Processing snapshots {start_frame} to {end_frame} (total: {end_frame - start_frame + 1} frames)")
+        # Progress is tracked in bytes read so the file is only scanned once
+        pbar = tqdm(total=os.path.getsize(input_file), unit="B", unit_scale=True)
         
-        for line in infile:
-            line = line.strip()
+        for frame in _iter_lammps_frames(infile):
+            # Check if this frame is within our desired range
+            if start_frame <= current_frame <= stop_frame:
+                # Check if this frame matches our sampling rate
+                if (current_frame - start_frame) % sample_rate == 0:
+                    col_layout = convert_frame_to_xyz(frame, outfile, filter_type, atom_labels,
+                                                      index_assignments, col_layout, atom_buffers)
+                    frames_written += 1
             
-            if line.startswith("ITEM: TIMESTEP"):
-                # If we have collected a previous frame, process it
-                if frame_lines and "ITEM: TIMESTEP" in frame_lines[0]:
-                    # Check if this frame is within our desired range
-                    if start_frame <= current_frame <= end_frame:
-                        # Check if this frame matches our sampling rate
-                        if (current_frame - start_frame) % sample_rate == 0:
-                            convert_frame_to_xyz(frame_lines, outfile, filter_type, atom_labels, index_assignments)
-                            frames_written += 1
-                        pbar.update(1)
-                    
-                    current_frame += 1
-                    
-                    # If we've passed the end_frame, we can stop processing
-                    if current_frame > end_frame:
-                        break
-                
-                # Start a new frame
-                frame_lines = [line]
-                current_section = "timestep"
-            else:
-                frame_lines.append(line)
-        
-        # Process the last frame if it's within range
-        if frame_lines and start_frame <= current_frame <= end_frame:
-            if (current_frame - start_frame) % sample_rate == 0:
-                convert_frame_to_xyz(frame_lines, outfile, filter_type, atom_labels, index_assignments)
-                frames_written += 1
-            pbar.update(1)
+            current_frame += 1
+            pbar.update(infile.tell() - pbar.n)
+            
+            # If we've passed the end_frame, we can stop processing
+            if current_frame > stop_frame:
+                break
+        pbar.update(infile.tell() - pbar.n)
+        
+        # Either the index of the final frame in the file, or end_frame if we stopped early
+        last_frame = min(current_frame - 1, stop_frame)
         
         pbar.close()
         print(f"Conversion complete. Output saved to {output_file}")
-        print(f"Processed frames {start_frame} to {end_frame}, wrote {frames_written} frames")
+        if start_frame > last_frame:
+            print(f"Warning: start_frame ({start_frame}) is beyond the last frame ({last_frame}), no frames written")
+        else:
+            print(f"Processed frames {start_frame} to {last_frame}, wrote {frames_written} frames")
 
 def sample_xyz_file(input_file, output_file, sample_rate=1, start_frame=None, end_frame=None):
     """
@@ -135,104 +175,181 @@ def sample_xyz_file(input_file, output_file, sample_rate=1, start_frame=None, en
         start_frame (int, optional): Starting snapshot index (0-based). If None, start from beginning.
         end_frame (int, optional): Ending snapshot index (0-based, inclusive). If None, go to end.
     """
+    import mmap
+    import os
     from tqdm import tqdm
     
-    # First pass: count total frames
-    total_frames = 0
-    with open(input_file, 'r') as f:
-        while True:
-            line = f.readline()
-            if not line:
-                break
-            
-            # First line of each frame is atom count
-            try:
-                atom_count = int(line.strip())
-                total_frames += 1
-                
-                # Skip comment line
-                f.readline()
-                
-                # Skip atom lines
-                for _ in range(atom_count):
-                    f.readline()
-            except ValueError:
-                break
-    
     # Set default values for start_frame and end_frame
-    if start_frame is None:
+    if start_frame is None or start_frame < 0:
         start_frame = 0
-    if end_frame is None:
-        end_frame = total_frames - 1
     
-    # Validate frame range
-    if start_frame < 0:
-        start_frame = 0
-    if end_frame >= total_frames:
-        end_frame = total_frames - 1
-    if start_frame > end_frame:
+    # The frame count is not known up front, so an open end_frame runs to the end of the file
+    stop_frame = float('inf') if end_frame is None else end_frame
+    if start_frame > stop_frame:
         print(f"Error: start_frame ({start_frame}) cannot be greater than end_frame ({end_frame})")
         return
     
-    frames_to_process = end_frame - start_frame + 1
+    # An empty file has no frames (and cannot be memory-mapped)
+    if os.path.getsize(input_file) == 0:
+        print(f"Error: {input_file} is empty")
+        return
     
-    # Second pass: process and sample frames
-    with open(input_file, 'r') as infile, open(output_file, 'w') as outfile:
+    # Single pass: frames are located in the mapped input and copied as one slice each
+    with open(input_file, 'rb') as infile, \
+            mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            memoryview(mm) as view, \
+            open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as outfile:
         current_frame = 0
         frames_written = 0
         
         print(f"Sampling XYZ file...")
-        print(f"Processing snapshots {start_frame} to {end_frame} (total: {frames_to_process} frames)")
+        if end_frame is None:
+            print(f"Processing snapshots {start_frame} to end of file")
+        else:
+            print(f"Processing snapshots {start_frame} to {end_frame} (total: {end_frame - start_frame + 1} frames)")
         print(f"Sample rate: every {sample_rate} frame(s)")
-        pbar = tqdm(total=frames_to_process, unit="frames")
+        pbar = tqdm(total=len(mm), unit="B", unit_scale=True)
         
-        while True:
-            # Read atom count line
-            atom_count_line = infile.readline()
-            if not atom_count_line:
-                break
-            
-            try:
-                atom_count = int(atom_count_line.strip())
-            except ValueError:
-                break
-            
-            # Read comment line
-            comment_line = infile.readline()
-            if not comment_line:
-                break
-            
-            # Read atom lines
-            atom_lines = []
-            for _ in range(atom_count):
-                atom_line = infile.readline()
-                if not atom_line:
-                    break
-                atom_lines.append(atom_line)
-            
+        # Selected frames that follow each other in the input are copied as one run
+        run_start = run_end = 0
+        for start, end in _iter_xyz_frames(mm):
             # Check if this frame is within our desired range
-            if start_frame <= current_frame <= end_frame:
+            if start_frame <= current_frame <= stop_frame:
                 # Check if this frame matches our sampling rate
                 if (current_frame - start_frame) % sample_rate == 0:
-                    # Write this frame to output
-                    outfile.write(atom_count_line)
-                    outfile.write(comment_line)
-                    for atom_line in atom_lines:
-                        outfile.write(atom_line)
+                    # Extend the current run, or write it out and start a new one
+                    if start != run_end:
+                        _copy_range(infile, outfile, view, run_start, run_end)
+                        run_start = start
+                    run_end = end
                     frames_written += 1
-                pbar.update(1)
             
             current_frame += 1
+            pbar.update(end - pbar.n)
             
             # If we've passed the end_frame, we can stop processing
-            if current_frame > end_frame:
+            if current_frame > stop_frame:
                 break
+        _copy_range(infile, outfile, view, run_start, run_end)
+        
+        # Either the index of the final frame in the file, or end_frame if we stopped early
+        last_frame = min(current_frame - 1, stop_frame)
         
         pbar.close()
         print(f"Sampling complete. Output saved to {output_file}")
-        print(f"Processed frames {start_frame} to {end_frame}, wrote {frames_written} frames")
+        if start_frame > last_frame:
+            print(f"Warning: start_frame ({start_frame}) is beyond the last frame ({last_frame}), no frames written")
+        else:
+            print(f"Processed frames {start_frame} to {last_frame}, wrote {frames_written} frames")
+
+def _iter_xyz_frames(mm):
+    """
+    Locate the frames of a memory-mapped XYZ file without creating its lines
+    
+    Args:
+        mm (mmap.mmap): Read-only memory map of the XYZ file
+        
+    Yields:
+        tuple: (start, end) byte offsets of each frame, from its atom count line
+               up to and including the newline of its last atom line
+    """
+    size = len(mm)
+    pos = 0
+    while pos < size:
+        start = pos
+        
+        # First line of each frame is atom count
+        eol = mm.find(b"\n", pos)
+        pos = size if eol == -1 else eol + 1
+        try:
+            atom_count = int(mm[start:pos])
+        except ValueError:
+            break
+        
+        # A frame needs at least its comment line
+        if pos >= size:
+            break
+        
+        # Skip comment line and atom lines
+        for _ in range(atom_count + 1):
+            if pos >= size:
+                break
+            eol = mm.find(b"\n", pos)
+            pos = size if eol == -1 else eol + 1
+        
+        yield start, pos
+
+def _copy_range(infile, outfile, view, start, end):
+    """
+    Copy the bytes [start, end) of the input file to the output file
+    
+    Large ranges go through os.sendfile so the data never leaves the kernel.
+    Small ranges, and platforms where sendfile cannot write to a regular file
+    (e.g. macOS), are written from the memory-mapped input instead.
+    
+    Args:
+        infile (file): Input file opened in binary mode
+        outfile (file): Output file opened in binary mode
+        view (memoryview): View of the memory-mapped input file
+        start (int): Offset of the first byte to copy
+        end (int): Offset one past the last byte to copy
+    """
+    import os
+    
+    if end - start >= _SENDFILE_MIN_SIZE and hasattr(os, 'sendfile'):
+        # sendfile writes at the file descriptor's position, behind the output buffer
+        outfile.flush()
+        try:
+            while start < end:
+                sent = os.sendfile(outfile.fileno(), infile.fileno(), start, end - start)
+                if sent == 0:
+                    break
+                start += sent
+        except OSError:
+            pass  # Copy whatever is left from the mapping
+    
+    if start < end:
+        # Released right away so the mapping can be closed without waiting for the GC (PyPy)
+        with view[start:end] as data:
+            outfile.write(data)
+
+def _write_xyz_chunk(input_file, output_file, frame_ranges):
+    """
+    Copy the given frames of an XYZ file into one chunk file
+    
+    Runs in a worker process when chunks are written in parallel, so it maps
+    the input file itself instead of sharing the caller's mapping.
+    
+    Args:
+        input_file (str): Path to input XYZ file
+        output_file (str): Path to the chunk file to write
+        frame_ranges (list): (start, end) byte offsets of the frames to copy
+        
+    Returns:
+        int: Number of frames written
+    """
+    import mmap
+    
+    with open(input_file, 'rb') as infile, \
+            mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Chunks are read front to back, let the kernel read ahead aggressively
+        if hasattr(mmap, 'MADV_SEQUENTIAL') and hasattr(mm, 'madvise'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mm) as view, \
+                open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as outfile:
+            # Frames that follow each other in the input are copied as one run
+            run_start = run_end = 0
+            for start, end in frame_ranges:
+                if start != run_end:
+                    _copy_range(infile, outfile, view, run_start, run_end)
+                    run_start = start
+                run_end = end
+            _copy_range(infile, outfile, view, run_start, run_end)
+    
+    return len(frame_ranges)
 
-def chunk_xyz_file(input_file, output_base, num_chunks, sample_rate=1, start_frame=None, end_frame=None):
+def chunk_xyz_file(input_file, output_base, num_chunks, sample_rate=1, start_frame=None, end_frame=None,
+                   jobs=1):
     """
     Split an XYZ file into multiple chunk files with specified number of chunks.
     
@@ -243,42 +360,23 @@ def chunk_xyz_file(input_file, output_base, num_chunks, sample_rate=1, start_fra
         sample_rate (int, optional): Sample rate for frames (1 = every frame, 2 = every other, etc.)
         start_frame (int, optional): Starting snapshot index (0-based). If None, start from beginning.
         end_frame (int, optional): Ending snapshot index (0-based, inclusive). If None, go to end.
+        jobs (int, optional): Number of processes writing chunk files in parallel (1 = no worker processes)
     """
-    from tqdm import tqdm
+    import mmap
     import os
+    from concurrent.futures import ProcessPoolExecutor
     
-    # First pass: count total frames and collect frame data
-    total_frames = 0
-    frame_data = []  # Store (atom_count_line, comment_line, atom_lines) for each frame
+    # An empty file has no frames (and cannot be memory-mapped)
+    if os.path.getsize(input_file) == 0:
+        print(f"Error: {input_file} is empty")
+        return
     
-    print("Reading XYZ file...")
-    with open(input_file, 'r') as f:
-        while True:
-            # Read atom count line
-            atom_count_line = f.readline()
-            if not atom_count_line:
-                break
-            
-            try:
-                atom_count = int(atom_count_line.strip())
-            except ValueError:
-                break
-            
-            # Read comment line
-            comment_line = f.readline()
-            if not comment_line:
-                break
-            
-            # Read atom lines
-            atom_lines = []
-            for _ in range(atom_count):
-                atom_line = f.readline()
-                if not atom_line:
-                    break
-                atom_lines.append(atom_line)
-            
-            frame_data.append((atom_count_line, comment_line, atom_lines))
-            total_frames += 1
+    # First pass: record where each frame starts and ends
+    print("Indexing XYZ file...")
+    with open(input_file, 'rb') as infile, \
+            mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        frame_offsets = list(_iter_xyz_frames(mm))
+    total_frames = len(frame_offsets)
     
     # Set default values for start_frame and end_frame
     if start_frame is None:
@@ -296,10 +394,7 @@ def chunk_xyz_file(input_file, output_base, num_chunks, sample_rate=1, start_fra
         return
     
     # Apply frame range filtering and sampling
-    selected_frames = []
-    for i in range(start_frame, end_frame + 1):
-        if (i - start_frame) % sample_rate == 0:
-            selected_frames.append(frame_data[i])
+    selected_frames = list(range(start_frame, end_frame + 1, sample_rate))
     
     total_selected_frames = len(selected_frames)
     if total_selected_frames == 0:
@@ -321,7 +416,8 @@ def chunk_xyz_file(input_file, output_base, num_chunks, sample_rate=1, start_fra
     if not ext:
         ext = '.xyz'
     
-    # Split frames into chunks and write to separate files
+    # Assign the byte ranges of the selected frames to their chunks
+    chunks = []
     frame_idx = 0
     for chunk_num in range(num_chunks):
         # Calculate number of frames for this chunk
@@ -330,124 +426,702 @@ def chunk_xyz_file(input_file, output_base, num_chunks, sample_rate=1, start_fra
         # Generate output filename
         output_file = f"{base_name}_chunk_{chunk_num + 1:0{len(str(num_chunks))}d}{ext}"
         
-        print(f"Writing chunk {chunk_num + 1}/{num_chunks}: {chunk_size} frames -> {output_file}")
+        frame_ranges = [frame_offsets[frame] for frame in selected_frames[frame_idx:frame_idx + chunk_size]]
+        chunks.append((output_file, frame_ranges))
+        frame_idx += chunk_size
+    
+    # Second pass: copy each selected frame's bytes straight from the mapped input.
+    # Chunks are independent files, so they can be written by separate processes.
+    if jobs > 1:
+        print(f"Writing chunks with {jobs} processes...")
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_write_xyz_chunk, input_file, output_file, frame_ranges)
+                       for output_file, frame_ranges in chunks]
+            for (output_file, _), future in zip(chunks, futures):
+                print(f"  -> Saved {future.result()} frames to {output_file}")
+    else:
+        for chunk_num, (output_file, frame_ranges) in enumerate(chunks):
+            print(f"Writing chunk {chunk_num + 1}/{num_chunks}: {len(frame_ranges)} frames -> {output_file}")
+            _write_xyz_chunk(input_file, output_file, frame_ranges)
+            print(f"  -> Saved {len(frame_ranges)} frames to {output_file}")
+    
+    print(f"\nChunking complete! Created {num_chunks} chunk files.")
+
+def _import_numpy():
+    """
+    Import NumPy on first use, leaving the XYZ commands free of its import cost
+    
+    Returns:
+        bool: True if NumPy is available
+    """
+    global np, _numpy_loaded
+    if not _numpy_loaded:
+        _numpy_loaded = True
+        try:
+            import numpy as np
+        except ImportError:
+            pass  # NumPy is optional: without it atom blocks are parsed line by line
+    return np is not None
+
+def _build_jit_parser():
+    """
+    Define the Numba LAMMPS atom parser, compiled on its first call
+    
+    Numba is only imported here, so the XYZ commands and runs that never reach an
+    atom block don't pay for it. trajslicer_aot.py also builds its kernel from this.
+    
+    Returns:
+        callable: The jitted _parse_lammps_atoms_jit kernel
+    
+    Raises:
+        ImportError: If NumPy or Numba is not installed
+    """
+    global _EXACT_POW10, _atoi, _atof, _parse_lammps_atoms_jit
+    if not _import_numpy():
+        raise ImportError("The Numba atom parser requires NumPy")
+    from numba import njit
+    
+    # Powers of ten that are exactly representable as doubles
+    _EXACT_POW10 = np.array([10.0 ** i for i in range(23)])
+    
+    @njit(cache=True, boundscheck=False)
+    def _atoi(buf, start, end):
+        """Parse buf[start:end] as a decimal integer, returns (value, ok)"""
+        i = start
+        neg = False
+        if i < end and (buf[i] == 45 or buf[i] == 43):  # '-' or '+'
+            neg = buf[i] == 45
+            i += 1
+        if i == end or end - i > 18:
+            return 0, False
+        value = 0
+        while i < end:
+            digit = buf[i] - 48
+            if digit < 0 or digit > 9:
+                return 0, False
+            value = value * 10 + digit
+            i += 1
+        return (-value if neg else value), True
+    
+    @njit(cache=True, boundscheck=False)
+    def _atof(buf, start, end):
+        """
+        Parse buf[start:end] as a float, returns (value, ok)
         
-        with open(output_file, 'w') as outfile:
-            for _ in range(chunk_size):
-                if frame_idx < total_selected_frames:
-                    atom_count_line, comment_line, atom_lines = selected_frames[frame_idx]
-                    outfile.write(atom_count_line)
-                    outfile.write(comment_line)
-                    for atom_line in atom_lines:
-                        outfile.write(atom_line)
-                    frame_idx += 1
+        Only handles numbers whose decimal mantissa fits in 53 bits and whose
+        exponent is within +-22, where a single multiplication or division
+        by an exact power of ten gives the same correctly rounded result as
+        float(). Anything else (long mantissas, nan, inf) is reported as not ok.
+        """
+        i = start
+        neg = False
+        if i < end and (buf[i] == 45 or buf[i] == 43):  # '-' or '+'
+            neg = buf[i] == 45
+            i += 1
+        mantissa = 0
+        n_digits = 0
+        exponent = 0
+        while i < end and 48 <= buf[i] <= 57:
+            mantissa = mantissa * 10 + (buf[i] - 48)
+            n_digits += 1
+            i += 1
+        if i < end and buf[i] == 46:  # '.'
+            i += 1
+            while i < end and 48 <= buf[i] <= 57:
+                mantissa = mantissa * 10 + (buf[i] - 48)
+                n_digits += 1
+                exponent -= 1
+                i += 1
+        if n_digits == 0 or n_digits > 18:
+            return 0.0, False
+        if i < end and (buf[i] == 101 or buf[i] == 69):  # 'e' or 'E'
+            exp_value, ok = _atoi(buf, i + 1, end)
+            if not ok:
+                return 0.0, False
+            exponent += exp_value
+            i = end
+        if i != end or mantissa > 9007199254740992:
+            return 0.0, False
+        if exponent == 0:
+            value = float(mantissa)
+        elif 0 < exponent <= 22:
+            value = mantissa * _EXACT_POW10[exponent]
+        elif -22 <= exponent < 0:
+            value = mantissa / _EXACT_POW10[-exponent]
+        else:
+            return 0.0, False
+        return (-value if neg else value), True
+    
+    @njit(cache=True, boundscheck=False)
+    def _parse_lammps_atoms_jit(buf, x_col, y_col, z_col, type_col, id_col, types, ids, xyz):
+        """
+        Parse a newline separated LAMMPS atom block into caller-provided arrays
         
-        print(f"  -> Saved {chunk_size} frames to {output_file}")
+        Args:
+            buf (ndarray): uint8 view of the atom block
+            x_col, y_col, z_col, type_col (int): 0-based column of each field in a row
+            id_col (int): 0-based column of the atom ID, or -1 if there is none
+            types, ids (ndarray): int64 output arrays, at least as long as the number of rows
+            xyz (ndarray): float64[:, 3] output positions, as long as types
+        
+        Returns:
+            int: Number of rows written to the first n entries of the output arrays,
+                 or -1 if any row could not be parsed or the arrays are too short
+        """
+        n_atoms = len(types)
+        n_required = 4 if id_col < 0 else 5
+        n = len(buf)
+        pos = 0
+        row = 0
+        while pos < n:
+            col = 0
+            n_found = 0
+            while pos < n and buf[pos] != 10:  # '\n'
+                c = buf[pos]
+                if c == 32 or c == 9 or c == 13:  # ' ', '\t', '\r'
+                    pos += 1
+                    continue
+                start = pos
+                while pos < n and buf[pos] != 32 and buf[pos] != 9 and buf[pos] != 13 and buf[pos] != 10:
+                    pos += 1
+                if col == type_col or col == id_col:
+                    value, ok = _atoi(buf, start, pos)
+                    if not ok or row >= n_atoms:
+                        return -1
+                    if col == type_col:
+                        types[row] = value
+                    else:
+                        ids[row] = value
+                    n_found += 1
+                elif col == x_col or col == y_col or col == z_col:
+                    value, ok = _atof(buf, start, pos)
+                    if not ok or row >= n_atoms:
+                        return -1
+                    xyz[row, 0 if col == x_col else (1 if col == y_col else 2)] = value
+                    n_found += 1
+                col += 1
+            pos += 1
+            if col == 0:
+                continue  # Blank line
+            if n_found != n_required:
+                return -1
+            row += 1
+        return row
     
-    print(f"\nChunking complete! Created {num_chunks} chunk files.")
+    return _parse_lammps_atoms_jit
+
+_atom_parser = None
+_atom_parser_loaded = False
 
-def convert_frame_to_xyz(frame_lines, outfile, filter_type=None, atom_labels=None, index_assignments=None):
+def _get_atom_parser():
+    """
+    Load the compiled atom parser, once, when the first atom block is parsed
+    
+    Returns:
+        callable: Kernel filling atom arrays from an atom block, or None if neither
+                  Numba nor the trajslicer_aot.py build is available (atom blocks
+                  are then parsed with np.loadtxt)
+    """
+    global _atom_parser, _atom_parser_loaded
+    if _atom_parser_loaded:
+        return _atom_parser
+    _atom_parser_loaded = True
+    if not _import_numpy():
+        return None
+    
+    # The kernel precompiled by trajslicer_aot.py needs neither the Numba import
+    # nor the JIT warmup, so Numba is only loaded when that build is missing
+    try:
+        from _trajslicer_aot import parse_lammps_atoms_into
+        _atom_parser = parse_lammps_atoms_into
+    except ImportError:
+        # Not built, or built by an older trajslicer_aot.py with a different signature
+        try:
+            _atom_parser = _build_jit_parser()
+        except ImportError:
+            pass  # Numba is optional
+    return _atom_parser
+
+# 0-based column of each field in a LAMMPS atom line (None if the dump lacks it),
+# together with the ITEM: ATOMS header line and column names it was parsed from
+ColumnLayout = namedtuple('ColumnLayout', ['header', 'columns', 'x', 'y', 'z', 'type', 'id'])
+
+def parse_atom_header(line):
+    """
+    Parse the ITEM: ATOMS header line of a LAMMPS frame
+    
+    Args:
+        line (bytes): Header line, e.g. b"ITEM: ATOMS id type x y z"
+        
+    Returns:
+        ColumnLayout: Column layout of the atom lines that follow the header
+    """
+    columns = line.decode().split()[2:]
+    col_indices = {part: i for i, part in enumerate(columns)}
+    return ColumnLayout(line, columns, col_indices.get('x'), col_indices.get('y'), col_indices.get('z'),
+                        col_indices.get('type'), col_indices.get('id'))
+
+class AtomBuffers:
+    """
+    Atom arrays the parser writes into, reused from frame to frame
+    
+    They grow by doubling when a frame has more atom lines than they can hold and are
+    never shrunk, so a trajectory with a steady atom count allocates them only once.
+    
+    Attributes:
+        types (ndarray): int64 atom types
+        ids (ndarray): int64 atom IDs
+        positions (ndarray): float64[:, 3] x, y, z coordinates
+    """
+    def __init__(self):
+        self.types = None
+        self.ids = None
+        self.positions = None
+    
+    def reserve(self, n_atoms):
+        """
+        Make room for at least n_atoms rows
+        
+        Args:
+            n_atoms (int): Number of rows needed
+        
+        Returns:
+            tuple: (types, ids, positions) arrays with at least n_atoms rows
+        """
+        capacity = 0 if self.types is None else len(self.types)
+        if capacity < n_atoms:
+            capacity = max(n_atoms, 2 * capacity)
+            self.types = np.empty(capacity, np.int64)
+            self.ids = np.empty(capacity, np.int64)
+            self.positions = np.empty((capacity, 3), np.float64)
+        return self.types, self.ids, self.positions
+
+@dataclass
+class LammpsFrame:
+    """
+    Atoms of a single LAMMPS frame as parallel NumPy arrays (one array per field)
+    
+    Attributes:
+        types (ndarray): int64[N] atom types
+        ids (ndarray): int64[N] atom IDs, or None if the dump has no id column
+        positions (ndarray): float64[N, 3] x, y, z coordinates
+    """
+    types: object
+    ids: object
+    positions: object
+    
+    @classmethod
+    def from_atom_block(cls, atom_block, col_layout, atom_buffers=None, n_lines=None):
+        """
+        Parse the atom lines of a LAMMPS frame
+        
+        Uses the Numba kernel when Numba is installed and np.loadtxt otherwise.
+        
+        Args:
+            atom_block (bytes-like): Newline separated atom lines of a single LAMMPS frame
+            col_layout (ColumnLayout): Column layout from the ITEM: ATOMS header
+            atom_buffers (AtomBuffers, optional): Arrays for the Numba kernel to parse into.
+                                                  The returned frame then views them and is only
+                                                  valid until the buffers are used again.
+            n_lines (int, optional): Number of lines in atom_block, counted here if not given
+        
+        Returns:
+            LammpsFrame: Parsed atoms, or None if the block is not a clean table
+                         with non-negative atom types
+        """
+        import warnings
+        
+        frame = None
+        parse_lammps_atoms = _get_atom_parser()
+        if parse_lammps_atoms is not None:
+            # The kernel reads the block in place; every line holds at most one atom
+            buf = np.frombuffer(atom_block, dtype=np.uint8)
+            if n_lines is None:
+                n_lines = bytes(atom_block).count(b"\n") + 1
+            if atom_buffers is None:
+                atom_buffers = AtomBuffers()
+            types, ids, xyz = atom_buffers.reserve(n_lines)
+            n = parse_lammps_atoms(buf, col_layout.x, col_layout.y, col_layout.z, col_layout.type,
+                                   -1 if col_layout.id is None else col_layout.id, types, ids, xyz)
+            if n >= 0:
+                frame = cls(types[:n], ids[:n] if col_layout.id is not None else None, xyz[:n])
+        
+        if frame is None:
+            fields = [('type', np.int64), ('x', np.float64), ('y', np.float64), ('z', np.float64)]
+            usecols = [col_layout.type, col_layout.x, col_layout.y, col_layout.z]
+            if col_layout.id is not None:
+                fields.append(('id', np.int64))
+                usecols.append(col_layout.id)
+            
+            try:
+                with warnings.catch_warnings():
+                    # A block of blank lines is a frame without atoms, not worth a warning
+                    warnings.filterwarnings('ignore', 'loadtxt: input contained no data', UserWarning)
+                    table = np.loadtxt(io.BytesIO(atom_block), dtype=fields, usecols=usecols, comments=None,
+                                       ndmin=1)
+            except (ValueError, IndexError):
+                return None
+            
+            frame = cls(table['type'], table['id'] if col_layout.id is not None else None,
+                        np.column_stack((table['x'], table['y'], table['z'])))
+        
+        # Labels are looked up by indexing with the atom type
+        if len(frame.types) and frame.types.min() < 0:
+            return None
+        return frame
+    
+    def select_types(self, filter_type):
+        """
+        Keep only the atoms of the given types
+        
+        Args:
+            filter_type (list): List of atom types to keep
+            
+        Returns:
+            LammpsFrame: New frame holding the selected atoms
+        """
+        keep = np.isin(self.types, filter_type)
+        return LammpsFrame(self.types[keep], self.ids[keep] if self.ids is not None else None,
+                           self.positions[keep])
+    
+    def elements(self, atom_labels=None, index_assignments=None):
+        """
+        Element label of every atom
+        
+        Args:
+            atom_labels (dict): Mapping of atom types to element labels
+            index_assignments (dict, optional): Mapping of atom indices to element labels.
+                                              Takes precedence over atom_labels when specified.
+        
+        Returns:
+            ndarray: object[N] element labels
+        """
+        if len(self.types) == 0:
+            return np.empty(0, dtype=object)
+        
+        # Element label lookup table indexed by atom type
+        n_types = int(self.types.max()) + 1
+        if atom_labels is not None:
+            type_labels = [atom_labels.get(t, f"Type{t}") for t in range(n_types)]
+        else:
+            type_labels = [f"Type{t}" for t in range(n_types)]
+        elements = np.array(type_labels, dtype=object)[self.types]
+        
+        # Index assignments take precedence over type labels: look every ID up in the
+        # sorted assignment keys and take the assigned label wherever the key matches
+        if self.ids is not None and index_assignments:
+            keys = np.fromiter(index_assignments, dtype=np.int64, count=len(index_assignments))
+            order = np.argsort(keys)
+            keys = keys[order]
+            assigned_labels = np.array(list(index_assignments.values()), dtype=object)[order]
+            pos = np.minimum(np.searchsorted(keys, self.ids), len(keys) - 1)
+            elements = np.where(keys[pos] == self.ids, assigned_labels[pos], elements)
+        return elements
+    
+    def to_xyz_lines(self, atom_labels=None, index_assignments=None):
+        """
+        Format the atoms as XYZ atom lines
+        
+        Args:
+            atom_labels (dict): Mapping of atom types to element labels
+            index_assignments (dict, optional): Mapping of atom indices to element labels.
+                                              Takes precedence over atom_labels when specified.
+        
+        Returns:
+            list: Lines (without newline) in the format: element x y z atom_id
+        """
+        ids = self.ids if self.ids is not None else self.types  # Fallback to type if no ID
+        # tolist() hands back Python floats so the coordinates print exactly as float() would
+        return list(map("{} {} {} {} {}".format, self.elements(atom_labels, index_assignments).tolist(),
+                        self.positions[:, 0].tolist(), self.positions[:, 1].tolist(),
+                        self.positions[:, 2].tolist(), ids.tolist()))
+
+def _convert_atoms_numpy(atom_block, col_layout, filter_type=None, atom_labels=None, index_assignments=None,
+                         atom_buffers=None, n_lines=None):
+    """
+    Vectorized version of the per-atom loop in convert_frame_to_xyz
+    
+    Args:
+        atom_block (bytes-like): Newline separated atom lines of a single LAMMPS frame
+        col_layout (ColumnLayout): Column layout from the ITEM: ATOMS header
+        filter_type (list, optional): List of atom types to keep. If None, keep all atoms.
+        atom_labels (dict): Mapping of atom types to element labels
+        index_assignments (dict, optional): Mapping of atom indices to element labels.
+                                          Takes precedence over atom_labels when specified.
+        atom_buffers (AtomBuffers, optional): Arrays reused for parsing from frame to frame
+        n_lines (int, optional): Number of lines in atom_block, if already known
+    
+    Returns:
+        list: XYZ atom lines (element x y z atom_id), or None if the block is not a clean
+              table and has to go through the per-atom loop instead
+    """
+    if not len(atom_block):
+        return []
+    
+    frame = LammpsFrame.from_atom_block(atom_block, col_layout, atom_buffers, n_lines)
+    if frame is None:
+        return None  # Malformed lines are skipped one by one in the per-atom loop
+    
+    if filter_type is not None:
+        frame = frame.select_types(filter_type)
+    return frame.to_xyz_lines(atom_labels, index_assignments)
+
+def _convert_all_type_labels(atom_lines, col_layout, label_of, filter_type=None, index_assignments=None):
+    """
+    Per-atom loop for the default case: every atom is kept and labelled by its type
+    
+    Args:
+        atom_lines (list): Atom lines (bytes) of a single LAMMPS frame
+        col_layout (ColumnLayout): Column layout from the ITEM: ATOMS header
+        label_of (list): Element label of each atom type, indexed by type
+        filter_type, index_assignments: Unused, accepted so all per-atom loops share a signature
+    
+    Returns:
+        list: XYZ atom lines (element x y z atom_id)
+    """
+    x_col, y_col, z_col = col_layout.x, col_layout.y, col_layout.z
+    type_col, id_col = col_layout.type, col_layout.id
+    n_labels = len(label_of)
+    
+    xyz_atom_lines = []
+    # Builtins and bound methods bound to locals once, not looked up again for every atom
+    _append = xyz_atom_lines.append
+    _int = int
+    _float = float
+    for line in atom_lines:
+        if not line or line.startswith(b"ITEM:"):
+            continue  # Skip empty lines or new section headers
+        
+        parts = line.split()
+        if len(parts) >= 2:
+            try:
+                atom_type = _int(parts[type_col])
+                atom_id = _int(parts[id_col]) if id_col is not None else atom_type  # Fallback to type if no ID
+                element = label_of[atom_type] if 0 <= atom_type < n_labels else f"Type{atom_type}"
+                
+                # XYZ format: element x y z atom_id
+                x = _float(parts[x_col])
+                y = _float(parts[y_col])
+                z = _float(parts[z_col])
+                _append(f"{element} {x} {y} {z} {atom_id}")
+            except (ValueError, IndexError):
+                continue  # Skip lines that cause errors
+    
+    return xyz_atom_lines
+
+def _convert_filtered(atom_lines, col_layout, label_of, filter_type, index_assignments=None):
+    """
+    Per-atom loop keeping only the atom types in filter_type, labelled by their type
+    
+    Args:
+        atom_lines (list): Atom lines (bytes) of a single LAMMPS frame
+        col_layout (ColumnLayout): Column layout from the ITEM: ATOMS header
+        label_of (list): Element label of each atom type, indexed by type
+        filter_type (list): List of atom types to keep
+        index_assignments: Unused, accepted so all per-atom loops share a signature
+    
+    Returns:
+        list: XYZ atom lines (element x y z atom_id)
+    """
+    x_col, y_col, z_col = col_layout.x, col_layout.y, col_layout.z
+    type_col, id_col = col_layout.type, col_layout.id
+    n_labels = len(label_of)
+    keep_types = set(filter_type)
+    
+    xyz_atom_lines = []
+    # Local aliases, as in _convert_all_type_labels
+    _append = xyz_atom_lines.append
+    _int = int
+    _float = float
+    for line in atom_lines:
+        if not line or line.startswith(b"ITEM:"):
+            continue  # Skip empty lines or new section headers
+        
+        parts = line.split()
+        if len(parts) >= 2:
+            try:
+                atom_type = _int(parts[type_col])
+                atom_id = _int(parts[id_col]) if id_col is not None else atom_type  # Fallback to type if no ID
+                
+                # Check if we should keep this atom type
+                if atom_type in keep_types:
+                    element = label_of[atom_type] if 0 <= atom_type < n_labels else f"Type{atom_type}"
+                    
+                    # XYZ format: element x y z atom_id
+                    x = _float(parts[x_col])
+                    y = _float(parts[y_col])
+                    z = _float(parts[z_col])
+                    _append(f"{element} {x} {y} {z} {atom_id}")
+            except (ValueError, IndexError):
+                continue  # Skip lines that cause errors
+    
+    return xyz_atom_lines
+
+def _convert_index_assigned(atom_lines, col_layout, label_of, filter_type, index_assignments):
+    """
+    Per-atom loop where index assignments take precedence over type labels
+    
+    Args:
+        atom_lines (list): Atom lines (bytes) of a single LAMMPS frame
+        col_layout (ColumnLayout): Column layout from the ITEM: ATOMS header, with an id column
+        label_of (list): Element label of each atom type, indexed by type
+        filter_type (list): List of atom types to keep. If None, keep all atoms.
+        index_assignments (dict): Mapping of atom indices to element labels
+    
+    Returns:
+        list: XYZ atom lines (element x y z atom_id)
+    """
+    x_col, y_col, z_col = col_layout.x, col_layout.y, col_layout.z
+    type_col, id_col = col_layout.type, col_layout.id
+    n_labels = len(label_of)
+    keep_types = set(filter_type) if filter_type is not None else None
+    
+    xyz_atom_lines = []
+    # Local aliases, as in _convert_all_type_labels
+    _append = xyz_atom_lines.append
+    _int = int
+    _float = float
+    _get_assigned = index_assignments.get
+    for line in atom_lines:
+        if not line or line.startswith(b"ITEM:"):
+            continue  # Skip empty lines or new section headers
+        
+        parts = line.split()
+        if len(parts) >= 2:
+            try:
+                atom_type = _int(parts[type_col])
+                atom_id = _int(parts[id_col])
+                
+                # Check if we should keep this atom type (for filtering)
+                if keep_types is None or atom_type in keep_types:
+                    # Determine element label: index assignments take precedence over type labels
+                    element = _get_assigned(atom_id)
+                    if element is None:
+                        element = label_of[atom_type] if 0 <= atom_type < n_labels else f"Type{atom_type}"
+                    
+                    # XYZ format: element x y z atom_id
+                    x = _float(parts[x_col])
+                    y = _float(parts[y_col])
+                    z = _float(parts[z_col])
+                    _append(f"{element} {x} {y} {z} {atom_id}")
+            except (ValueError, IndexError):
+                continue  # Skip lines that cause errors
+    
+    return xyz_atom_lines
+
+def convert_frame_to_xyz(frame, outfile, filter_type=None, atom_labels=None, index_assignments=None,
+                         col_layout=None, atom_buffers=None):
     """
     Convert a single LAMMPS frame to XYZ format
     
     Args:
-        frame_lines (list): Lines for a single frame
+        frame (bytes): Raw bytes of a single frame, starting at its ITEM: TIMESTEP line
         outfile (file): Output file to write to
         filter_type (list, optional): List of atom types to keep. If None, keep all atoms.
         atom_labels (dict): Mapping of atom types to element labels
         index_assignments (dict, optional): Mapping of atom indices to element labels.
                                           Takes precedence over atom_labels when specified.
+        col_layout (ColumnLayout, optional): Layout returned for the previous frame. Reused as long
+                                             as the ITEM: ATOMS header is unchanged.
+        atom_buffers (AtomBuffers, optional): Parsing arrays shared by all frames of a conversion
+    
+    Returns:
+        ColumnLayout: Layout of this frame's atom lines, to pass in for the next frame
     
     Note:
         Output XYZ format includes atom ID as additional column: element x y z atom_id
         Header includes Properties specification: Properties=species:S:1:pos:R:3:id:I:1
     """
-    # Find indices of important sections
+    # Find indices of important sections. Only the header lines are split off,
+    # the atom block stays in the frame buffer.
+    header_lines = []
     atom_count_index = None
-    atoms_section_index = None
+    atoms_start = None
     box_bounds_index = None
     timestep_value = None
     
-    for i, line in enumerate(frame_lines):
+    pos = 0
+    while pos < len(frame):
+        eol = frame.find(b"\n", pos)
+        if eol == -1:
+            eol = len(frame)
+        line = frame[pos:eol]
+        i = len(header_lines)
+        header_lines.append(line)
+        pos = eol + 1
         if i == 1:  # Second line is the timestep value
-            timestep_value = line
-        elif line.startswith("ITEM: NUMBER OF ATOMS"):
+            timestep_value = line.strip().decode()
+        elif line.startswith(b"ITEM: NUMBER OF ATOMS"):
             atom_count_index = i
-        elif line.startswith("ITEM: BOX BOUNDS"):
+        elif line.startswith(b"ITEM: BOX BOUNDS"):
             box_bounds_index = i
-        elif line.startswith("ITEM: ATOMS"):
-            atoms_section_index = i
+        elif line.startswith(b"ITEM: ATOMS"):
+            atoms_start = pos
             break
     
-    if atom_count_index is None or atoms_section_index is None:
-        return  # Skip this frame if it doesn't have the required sections
+    if atom_count_index is None or atoms_start is None:
+        return col_layout  # Skip this frame if it doesn't have the required sections
     
-    # Extract atom lines (skip the header)
-    atom_header = frame_lines[atoms_section_index]
-    atom_lines = frame_lines[atoms_section_index + 1:]
+    # The atom lines (everything after the header) as a zero-copy view of the frame
+    atom_header = header_lines[-1]
+    atom_block = memoryview(frame)[atoms_start:]
     
-    # Get the column indices for x, y, z and type from the atom header
-    header_parts = atom_header.split()
-    col_indices = {part: i-2 for i, part in enumerate(header_parts[2:])}
+    # Get the column indices for x, y, z and type from the atom header. The layout
+    # rarely changes within a dump, so only parse the header when it differs.
+    if col_layout is None or col_layout.header != atom_header:
+        col_layout = parse_atom_header(atom_header)
+        
+        # Warn if no id column found - atom ID is important for tracking atoms
+        if col_layout.id is None:
+            print("Warning: No 'id' column found in LAMMPS dump file. Using atom type as fallback for ID column.")
+            print("Available columns:", col_layout.columns)
     
     # We need positions (x, y, z), type, and optionally id
-    x_idx = col_indices.get('x')
-    y_idx = col_indices.get('y')
-    z_idx = col_indices.get('z')
-    type_idx = col_indices.get('type')
-    id_idx = col_indices.get('id')  # Atom ID/index for index assignments
+    x_col, y_col, z_col = col_layout.x, col_layout.y, col_layout.z
+    type_col = col_layout.type
+    id_col = col_layout.id  # Atom ID/index for index assignments
     
-    if x_idx is None or y_idx is None or z_idx is None or type_idx is None:
+    if x_col is None or y_col is None or z_col is None or type_col is None:
         print("Error: Could not find x, y, z, or type columns in the atom header")
-        return
+        return col_layout
     
-    # Warn if no id column found - atom ID is important for tracking atoms
-    if id_idx is None:
-        print("Warning: No 'id' column found in LAMMPS dump file. Using atom type as fallback for ID column.")
-        print("Available columns:", list(col_indices.keys()))
+    # The compiled loop parses and formats in one go, so it is preferred over NumPy
+    xyz_atom_lines = None
+    if _trajslicer_core is None and _import_numpy():
+        # Counting on the frame bytes sizes the parser arrays without a temporary array
+        n_lines = frame.count(b"\n", atoms_start) + 1
+        xyz_atom_lines = _convert_atoms_numpy(atom_block, col_layout, filter_type, atom_labels, index_assignments,
+                                              atom_buffers, n_lines)
     
-    # Filter atoms if filter_type is specified, otherwise keep all
-    xyz_atom_lines = []
-    for line in atom_lines:
-        if not line or line.startswith("ITEM:"):
-            continue  # Skip empty lines or new section headers
-            
-        parts = line.split()
-        if len(parts) >= 2:
-            try:
-                atom_type = int(parts[2 + type_idx])
-                atom_id = int(parts[2 + id_idx]) if id_idx is not None else None
-                
-                # Check if we should keep this atom type (for filtering)
-                if filter_type is None or atom_type in filter_type:
-                    # Determine element label: index assignments take precedence over type labels
-                    element = None
-                    if index_assignments is not None and atom_id is not None and atom_id in index_assignments:
-                        element = index_assignments[atom_id]
-                    elif atom_labels is not None:
-                        element = atom_labels.get(atom_type, f"Type{atom_type}")
-                    else:
-                        element = f"Type{atom_type}"
-                    
-                    # XYZ format: element x y z atom_id
-                    x = float(parts[2 + x_idx])
-                    y = float(parts[2 + y_idx])
-                    z = float(parts[2 + z_idx])
-                    atom_id_to_write = atom_id if atom_id is not None else atom_type  # Fallback to type if no ID
-                    xyz_atom_lines.append(f"{element} {x} {y} {z} {atom_id_to_write}")
-            except (ValueError, IndexError):
-                continue  # Skip lines that cause errors
+    if xyz_atom_lines is None:
+        # Element label of each atom type, indexed by type
+        if atom_labels:
+            label_of = [atom_labels.get(t, f"Type{t}") for t in range(max(atom_labels) + 1)]
+        else:
+            label_of = []
+        
+        # Pick the per-atom loop once so it carries no checks for options that are off
+        if _trajslicer_core is not None:
+            converter = _trajslicer_core.convert_atom_lines
+        elif index_assignments is not None and id_col is not None:
+            converter = _convert_index_assigned
+        elif filter_type is not None:
+            converter = _convert_filtered
+        else:
+            converter = _convert_all_type_labels
+        atom_lines = frame[atoms_start:].split(b"\n")
+        xyz_atom_lines = converter(atom_lines, col_layout, label_of, filter_type, index_assignments)
     
     # Get box dimensions for XYZ comment line
     box_x = None
     box_y = None
     box_z = None
     
-    if box_bounds_index is not None and box_bounds_index + 3 <= len(frame_lines):
+    if box_bounds_index is not None and box_bounds_index + 3 <= len(header_lines):
         try:
-            box_x_parts = frame_lines[box_bounds_index + 1].split()
-            box_y_parts = frame_lines[box_bounds_index + 2].split()
-            box_z_parts = frame_lines[box_bounds_index + 3].split()
+            box_x_parts = header_lines[box_bounds_index + 1].split()
+            box_y_parts = header_lines[box_bounds_index + 2].split()
+            box_z_parts = header_lines[box_bounds_index + 3].split()
             
             box_x = float(box_x_parts[1]) - float(box_x_parts[0])
             box_y = float(box_y_parts[1]) - float(box_y_parts[0])
@@ -455,20 +1129,19 @@ def convert_frame_to_xyz(frame_lines, outfile, filter_type=None, atom_labels=Non
         except (ValueError, IndexError):
             pass
     
-    # Write the XYZ frame
-    # First line: number of atoms
-    outfile.write(f"{len(xyz_atom_lines)}\n")
-    
-    # Second line: comment line with box dimensions, timestep, and properties
+    # Comment line with box dimensions, timestep, and properties
     comment = f"Timestep={timestep_value}"
     if box_x is not None and box_y is not None and box_z is not None:
         comment += f" Lattice=\"{box_x} 0.0 0.0 0.0 {box_y} 0.0 0.0 0.0 {box_z}\""
     comment += " Properties=species:S:1:pos:R:3:id:I:1"
-    outfile.write(f"{comment}\n")
     
-    # Atom lines: element x y z atom_id
-    for line in xyz_atom_lines:
-        outfile.write(f"{line}\n")
+    # Write the XYZ frame: number of atoms and comment line, then all atom lines
+    # (element x y z atom_id) joined into a single write
+    outfile.write(f"{len(xyz_atom_lines)}\n{comment}\n")
+    if xyz_atom_lines:
+        outfile.write("\n".join(xyz_atom_lines) + "\n")
+    
+    return col_layout
 
 def check_tqdm_installed():
     """Check if tqdm is installed, if not suggest installing it"""
@@ -510,6 +1183,8 @@ if __name__ == "__main__":
                         help='Ending snapshot index (0-based, inclusive, default: last frame)')
     parser.add_argument('--chunks', type=int, default=None,
                         help='Split XYZ file into specified number of chunks - XYZ files only')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of processes writing chunk files in parallel (default: 1) - XYZ files only')
     
     args = parser.parse_args()
     
@@ -531,6 +1206,9 @@ if __name__ == "__main__":
             if args.chunks <= 0:
                 print("Error: Number of chunks must be greater than 0")
                 sys.exit(1)
+            if args.jobs <= 0:
+                print("Error: Number of jobs must be greater than 0")
+                sys.exit(1)
             
             chunk_xyz_file(
                 args.input_file,
@@ -538,9 +1216,13 @@ if __name__ == "__main__":
                 args.chunks,
                 sample_rate=args.sample,
                 start_frame=args.start,
-                end_frame=args.end
+                end_frame=args.end,
+                jobs=args.jobs
             )
         else:
+            if args.jobs != 1:
+                print("Warning: --jobs option is only used with --chunks on XYZ files")
+            
             # Regular XYZ sampling
             sample_xyz_file(
                 args.input_file,
@@ -553,6 +1235,8 @@ if __name__ == "__main__":
     else:  # LAMMPS file
         if args.chunks is not None:
             print("Warning: --chunks option is only available for XYZ files")
+        if args.jobs != 1:
+            print("Warning: --jobs option is only used with --chunks on XYZ files")
         
         # Process custom atom labels if provided
         atom_labels = {1: 'C', 2: 'Xe'}  # Default labels